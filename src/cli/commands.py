@@ -3,16 +3,103 @@ CLI 命令实现
 
 实现 list/stat、info、run 命令
 """
+import functools
+import os
+import stat
 import sys
 import json
-import yaml
 from pathlib import Path
 from typing import Optional, List
-from loguru import logger
 
 from ..utils.config_loader import ConfigLoader
-from ..core.factory import AgentFactory
-from ..formatters.factory import FormatterFactory
+
+# 优先使用 orjson 解析 JSON（Rust 实现，比标准库快数倍），未安装时回退
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需改动
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 延迟加载的模块（list/stat 等轻量命令用不到，省掉冷启动导入开销）
+_logger = None
+_YamlLoader = None
+
+
+def _get_logger():
+    """延迟导入 loguru logger（模块级缓存，重复调用无额外开销）"""
+    global _logger
+    if _logger is None:
+        from loguru import logger
+        _logger = logger
+    return _logger
+
+
+def _parse_json_input(content: str) -> Optional[dict]:
+    """解析 JSON 输入，非字典结果包装为 {"input": ...}，解析失败返回 None"""
+    try:
+        data = _json_loads(content)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else {"input": data}
+
+
+def _parse_yaml_input(content: str) -> Optional[dict]:
+    """解析 YAML 输入，非字典结果包装为 {"input": ...}，解析失败返回 None"""
+    global _YamlLoader
+    import yaml  # 延迟导入：仅在确实需要解析 YAML 时付出导入成本
+
+    if _YamlLoader is None:
+        # 优先使用 libyaml 的 C 实现（比纯 Python 解析快一个数量级）
+        try:
+            from yaml import CSafeLoader as _YamlLoader
+        except ImportError:
+            from yaml import SafeLoader as _YamlLoader
+
+    try:
+        data = yaml.load(content, Loader=_YamlLoader)
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else {"input": data}
+
+
+# 已知扩展名只走对应的解析器，避免解析失败时再跑一遍另一种（更慢的）解析器
+_INPUT_LOADERS = {
+    '.json': _parse_json_input,
+    '.yaml': _parse_yaml_input,
+    '.yml': _parse_yaml_input,
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _load_and_parse(path_str: str, mtime_ns: int, suffix: str) -> dict:
+    """
+    读取并解析输入文件（按 (路径, mtime, 后缀) 做 LRU 缓存）
+
+    同一输入文件反复执行时（agent 调试场景很常见）跳过重复读取和解析；
+    mtime 加入缓存键，文件修改后自动失效
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # 已知扩展名：只调用对应的解析器，失败时直接按纯文本处理
+    loader = _INPUT_LOADERS.get(suffix)
+    if loader is not None:
+        data = loader(content)
+        return data if data is not None else {"input": content}
+
+    # 未知扩展名：首字符像 JSON 才尝试 JSON，否则直接走 YAML
+    if content.lstrip()[:1] in ('{', '['):
+        data = _parse_json_input(content)
+        if data is not None:
+            return data
+
+    data = _parse_yaml_input(content)
+    if data is not None:
+        return data
+
+    # 都失败了，返回文本
+    return {"input": content}
 
 
 class Commands:
@@ -25,37 +112,50 @@ class Commands:
         """
         self.config_loader = config_loader
         self.config = config_loader.config
-        self.factory = AgentFactory(self.config)
+
+    @functools.cached_property
+    def factory(self):
+        """Agent 工厂（按需构建：stat/info 等命令不需要时完全不创建）"""
+        from ..core.factory import AgentFactory
+        return AgentFactory(self.config)
 
     def list_command(self):
         """列举所有 models 和 agents"""
-        print("\n=== Models ===")
+        # 汇总后一次性写出，避免逐行 print 在 TTY 上触发多次 write 系统调用
+        lines = ["", "=== Models ==="]
         for name, model_config in self.config.models.items():
             status = "enabled" if model_config.enabled else "disabled"
-            print(f"  - {name} ({model_config.type}) [{status}]")
+            lines.append(f"  - {name} ({model_config.type}) [{status}]")
 
-        print("\n=== Agents ===")
+        lines.append("")
+        lines.append("=== Agents ===")
         agents_info = self.factory.list_agents()
         for name, info in agents_info.items():
             status = "enabled" if info['enabled'] else "disabled"
-            print(f"  - {name} -> {info['model_provider']} [{status}]")
+            lines.append(f"  - {name} -> {info['model_provider']} [{status}]")
             if info['description']:
-                print(f"      {info['description']}")
+                lines.append(f"      {info['description']}")
 
-        print()
+        lines.append("")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def stat_command(self):
         """统计 models 和 agents"""
         models = self.config.models
         agents = self.config.agents
 
-        enabled_models = len([m for m in models.values() if m.enabled])
-        enabled_agents = len([a for a in agents.values() if a.enabled])
+        # 生成器求和，不为计数物化临时列表
+        enabled_models = sum(1 for m in models.values() if m.enabled)
+        enabled_agents = sum(1 for a in agents.values() if a.enabled)
 
-        print("\n=== Statistics ===")
-        print(f"Total Models: {len(models)} ({enabled_models} enabled)")
-        print(f"Total Agents: {len(agents)} ({enabled_agents} enabled)")
-        print()
+        lines = [
+            "",
+            "=== Statistics ===",
+            f"Total Models: {len(models)} ({enabled_models} enabled)",
+            f"Total Agents: {len(agents)} ({enabled_agents} enabled)",
+            "",
+        ]
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def info_command(self, target_name: str):
         """
@@ -83,43 +183,51 @@ class Commands:
         """打印 model 信息"""
         model = self.config.models[model_name]
 
-        print(f"\n=== Model: {model_name} ===")
-        print(f"  Enabled: {model.enabled}")
-        print(f"  Type: {model.type}")
-        print(f"  API Base: {model.api_base}")
-        print(f"  Model: {model.model}")
-        print(f"  Max Tokens: {model.max_tokens}")
-        print(f"  Temperature: {model.temperature}")
+        lines = [
+            "",
+            f"=== Model: {model_name} ===",
+            f"  Enabled: {model.enabled}",
+            f"  Type: {model.type}",
+            f"  API Base: {model.api_base}",
+            f"  Model: {model.model}",
+            f"  Max Tokens: {model.max_tokens}",
+            f"  Temperature: {model.temperature}",
+        ]
 
         if model.type == 'vlm':
-            print(f"  Resize Image: {model.resize_image_for_api}")
-            print(f"  Max Image Size: {model.max_image_size}")
-            print(f"  Image Quality: {model.image_quality}")
+            lines.append(f"  Resize Image: {model.resize_image_for_api}")
+            lines.append(f"  Max Image Size: {model.max_image_size}")
+            lines.append(f"  Image Quality: {model.image_quality}")
 
-        print()
+        lines.append("")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def _print_agent_info(self, agent_name: str):
         """打印 agent 信息"""
         reg = self.config.agents[agent_name]
 
-        print(f"\n=== Agent: {agent_name} ===")
-        print(f"  Enabled: {reg.enabled}")
-        print(f"  Model Provider: {reg.model_provider}")
-        print(f"  Description: {reg.description}")
-        print(f"  Config: {reg.config}")
+        lines = [
+            "",
+            f"=== Agent: {agent_name} ===",
+            f"  Enabled: {reg.enabled}",
+            f"  Model Provider: {reg.model_provider}",
+            f"  Description: {reg.description}",
+            f"  Config: {reg.config}",
+        ]
 
         # 加载详细配置（所有已加载的 agent 都是启用的）
         try:
             agent_config, _ = self.config_loader.load_agent_config(agent_name)
-            print(f"  Type: {agent_config.type}")
-            print(f"  Inputs: {agent_config.inputs}")
-            print(f"  Outputs: {agent_config.outputs}")
-            print(f"  System Prompt: {agent_config.system_prompt}")
-            print(f"  User Prompt: {agent_config.user_prompt or 'N/A'}")
+            lines.append(f"  Type: {agent_config.type}")
+            lines.append(f"  Inputs: {agent_config.inputs}")
+            lines.append(f"  Outputs: {agent_config.outputs}")
+            lines.append(f"  System Prompt: {agent_config.system_prompt}")
+            lines.append(f"  User Prompt: {agent_config.user_prompt or 'N/A'}")
         except Exception as e:
-            logger.warning(f"无法加载 Agent 详细配置: {e}")
+            _get_logger().warning(f"无法加载 Agent 详细配置: {e}")
 
-        print()
+        lines.append("")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def run_command(
         self,
@@ -143,6 +251,10 @@ class Commands:
             save_images: 是否保存原始图像到本地
             cache_override: 覆盖配置文件的缓存设置（None 表示使用配置文件）
         """
+        # 仅 run 命令需要的依赖在此加载，避免拖慢其他命令的启动
+        logger = _get_logger()
+        from ..formatters.factory import FormatterFactory
+
         try:
             # 创建 Agent
             logger.info(f"创建 Agent: {agent_name}")
@@ -179,7 +291,6 @@ class Commands:
 
             # 格式化输出
             formatter = FormatterFactory.create(format_type)
-            formatted_output = formatter.format(result)
 
             # 确定输出文件路径
             if output_file is None:
@@ -202,11 +313,11 @@ class Commands:
             else:
                 output_file = Path(output_file)
 
-            # 输出到文件
+            # 输出到文件（流式序列化，避免在内存中构建完整输出字符串）
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_output)
+                formatter.stream(result, f)
 
             # 获取 agent 执行时间
             agent_exec_time = result.get('execution_time', total_time)
@@ -264,13 +375,19 @@ class Commands:
         has_structured_data = False
 
         for value in outputs.values():
-            if isinstance(value, str):
-                # 检查是否有长文本（多行或超过 200 字符）
-                if '\n' in value or len(value) > 200:
+            # 输出值由 JSON/YAML 解析产生，都是精确类型，type() 比 isinstance 快
+            t = type(value)
+            if t is str:
+                # 检查是否有长文本（超过 200 字符或多行；先比长度，避免线性扫描）
+                if not has_long_text and (len(value) > 200 or '\n' in value):
                     has_long_text = True
-            elif isinstance(value, (list, dict)):
+            elif t is list or t is dict:
                 has_structured_data = True
 
+            # 两个标志都已确定时提前结束
+            if has_long_text and has_structured_data:
+                break
+
         # 判断逻辑：
         # 1. 如果有结构化数据（列表、字典），优先使用 json（保持数据结构完整性）
         if has_structured_data:
@@ -300,86 +417,45 @@ class Commands:
         if inputs is None:
             return {}, None
 
-        # 检查是否是文件路径
-        input_path = Path(inputs)
-        if input_path.exists() and input_path.is_file():
-            # 获取文件basename（不含扩展名）
-            input_basename = input_path.stem
-
-            # 读取文件
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # 根据文件扩展名判断格式
-            suffix = input_path.suffix.lower()
-
-            # 尝试解析为 YAML
-            if suffix in ['.yaml', '.yml']:
-                try:
-                    data = yaml.safe_load(content)
-                    if isinstance(data, dict):
-                        return data, input_basename
-                    else:
-                        return {"input": data}, input_basename
-                except yaml.YAMLError:
-                    pass
-
-            # 尝试解析为 JSON
-            if suffix == '.json':
-                try:
-                    data = json.loads(content)
-                    if isinstance(data, dict):
-                        return data, input_basename
-                    else:
-                        return {"input": data}, input_basename
-                except json.JSONDecodeError:
-                    pass
-
-            # 如果没有明确扩展名，先尝试 JSON，再尝试 YAML
-            if suffix not in ['.json', '.yaml', '.yml']:
-                # 先尝试 JSON
-                try:
-                    data = json.loads(content)
-                    if isinstance(data, dict):
-                        return data, input_basename
-                    else:
-                        return {"input": data}, input_basename
-                except json.JSONDecodeError:
-                    pass
-
-                # 再尝试 YAML
-                try:
-                    data = yaml.safe_load(content)
-                    if isinstance(data, dict):
-                        return data, input_basename
-                    else:
-                        return {"input": data}, input_basename
-                except yaml.YAMLError:
-                    pass
-
-            # 都失败了，返回文本
-            return {"input": content}, input_basename
+        # 检查是否是文件路径：先低成本排除明显不是路径的字符串（含换行、
+        # 超长、或以 { / [ 开头的 JSON），避免对每个输入都做系统调用；
+        # 再用单次 os.stat 同时完成存在性和普通文件判断
+        st = None
+        if '\n' not in inputs and len(inputs) <= 4096 and inputs[:1] not in ('{', '['):
+            try:
+                st = os.stat(inputs)
+            except (OSError, ValueError):
+                st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode):
+            input_path = Path(inputs)
+
+            # 读取并解析（按 mtime 缓存，同一文件重复执行时免去重新解析；
+            # mtime 直接复用上面 stat 的结果，不再额外调用）
+            data = _load_and_parse(
+                str(input_path),
+                st.st_mtime_ns,
+                input_path.suffix.lower()
+            )
+            return data, input_path.stem
 
         # 不是文件，尝试解析字符串
         # 先尝试 JSON
-        try:
-            data = json.loads(inputs)
-            if isinstance(data, dict):
-                return data, None
-            else:
-                return {"input": data}, None
-        except json.JSONDecodeError:
-            pass
+        data = _parse_json_input(inputs)
+        if data is not None:
+            return data, None
+
+        # 明显不可能是 YAML 映射/列表的短文本（无冒号、无换行、不以
+        # { / [ / - 开头），YAML 也只会解析成裸标量，直接按纯文本处理，
+        # 跳过整套 YAML 扫描器（run agent "一句话" 是最常见的 CLI 用法）
+        if (':' not in inputs and '\n' not in inputs
+                and not inputs.lstrip().startswith(('{', '[', '-'))):
+            return {"input": inputs}, None
 
         # 再尝试 YAML
-        try:
-            data = yaml.safe_load(inputs)
-            if isinstance(data, dict):
-                return data, None
-            else:
-                return {"input": data}, None
-        except yaml.YAMLError:
-            pass
+        data = _parse_yaml_input(inputs)
+        if data is not None:
+            return data, None
 
         # 都不是，返回纯文本
         return {"input": inputs}, None
@@ -3,15 +3,19 @@ Agent 基类
 
 执行 Agent 的核心逻辑
 """
+import os
 import re
 import json
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from loguru import logger
 
 from ..utils.config_loader import AgentConfig, ModelConfig, Config
@@ -19,6 +23,112 @@ from ..utils.image_processor import ImageProcessor
 from .model_client import ModelClient
 from .validator import Validator
 
+# 预编译模板字段正则，避免每次渲染都重新编译
+_FIELD_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# 优先使用 orjson 序列化模板字段值（Rust 实现，嵌套结构快 5-10 倍），
+# 未安装时回退标准库；两者输出均为 2 空格缩进、不转义非 ASCII。
+# OPT_NON_STR_KEYS：YAML 输入可能带非字符串键，与标准库一样转成字符串
+try:
+    import orjson
+
+    def _json_dumps_pretty(value: Any) -> str:
+        return orjson.dumps(
+            value,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ).decode('utf-8')
+except ImportError:
+    def _json_dumps_pretty(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+# 下载/复制图像时的写缓冲大小；超过此阈值的本地文件跳过 copy2 的全量元数据复制
+_COPY_BUFFER_SIZE = 1 << 20  # 1 MB
+_LARGE_COPY_THRESHOLD = 8 * 1024 * 1024  # 8 MB
+
+
+def _format_field_value(value: Any, _memo: Optional[dict] = None) -> str:
+    """
+    格式化模板字段值（列表/字典转为 JSON，其余转字符串）
+
+    _memo 是单次渲染内的序列化缓存（按对象 id 索引）：同一个列表/字典
+    被多个字段引用时只做一次 JSON 序列化。渲染期间 inputs 持有所有值
+    的引用，id 不会被复用。
+    """
+    if isinstance(value, (list, dict)):
+        if _memo is None:
+            return _json_dumps_pretty(value)
+        key = id(value)
+        cached = _memo.get(key)
+        if cached is None:
+            cached = _json_dumps_pretty(value)
+            _memo[key] = cached
+        return cached
+    return str(value)
+
+
+def _compile_template(template: str) -> List[str]:
+    """
+    预解析模板为片段列表
+
+    返回 _FIELD_RE.split 的结果：偶数下标为字面文本，奇数下标为字段名
+    """
+    return _FIELD_RE.split(template)
+
+
+def _render_segments(segments: List[str], inputs: Dict[str, Any]) -> str:
+    """渲染预解析的模板片段（替代每次全文正则扫描）"""
+    # 只有一个片段说明模板无字段引用，直接返回
+    if len(segments) == 1:
+        return segments[0]
+
+    parts = []
+    memo = {}
+    for i, seg in enumerate(segments):
+        if i % 2 == 0:
+            parts.append(seg)
+        else:
+            value = inputs.get(seg, f"{{{{不存在的字段: {seg}}}}}")
+            parts.append(_format_field_value(value, memo))
+
+    return ''.join(parts)
+
+
+def _specialize_renderer(segments: List[str]):
+    """
+    为固定模板生成专用渲染函数（部分求值）
+
+    模板在 Agent 生命周期内不变，把字面片段作为常量内联进生成函数的
+    源码，渲染退化为一次字符串拼接表达式求值——没有循环、下标判断和
+    正则机制。无字段模板直接返回常量函数。
+    """
+    if len(segments) == 1:
+        text = segments[0]
+        return lambda inputs: text
+
+    parts = []
+    field_count = 0
+    for i, seg in enumerate(segments):
+        if i % 2 == 0:
+            # 空字面片段（模板以字段开头/结尾时出现）无需参与拼接
+            if seg:
+                parts.append(repr(seg))
+        else:
+            missing = f"{{{{不存在的字段: {seg}}}}}"
+            parts.append(f"_fmt(inputs.get({seg!r}, {missing!r}), _memo)")
+            field_count += 1
+
+    # 多字段模板带上单次渲染的序列化缓存（见 _format_field_value）
+    memo_init = "{}" if field_count > 1 else "None"
+    source = (
+        "def _render(inputs, _fmt=_format_field_value):\n"
+        f"    _memo = {memo_init}\n"
+        "    return " + " + ".join(parts)
+    )
+    namespace = {'_format_field_value': _format_field_value}
+    exec(source, namespace)
+    return namespace['_render']
+
 
 class Agent:
     """Agent 基类"""
@@ -47,6 +157,33 @@ class Agent:
         self.model_config = model_config
         self.api_config = api_config  # 保存 API 配置（用于获取 output_dir 等）
 
+        # 预解析 prompt 模板（模板在 Agent 生命周期内不变，只解析一次），
+        # 并生成模板专用的渲染函数（字面片段内联为常量）
+        self._system_segments = _compile_template(prompts['system'])
+        self._user_segments = (
+            _compile_template(prompts['user']) if prompts['user'] else None
+        )
+        self._render_system = _specialize_renderer(self._system_segments)
+        self._render_user = (
+            _specialize_renderer(self._user_segments)
+            if self._user_segments is not None else None
+        )
+
+        # 模板引用的字段集合（构造时提取一次，每次 run 的模板验证只剩
+        # 集合差运算；split 结果的奇数下标即字段名）
+        self._referenced_fields = set(self._system_segments[1::2])
+        if self._user_segments is not None:
+            self._referenced_fields.update(self._user_segments[1::2])
+
+        # 无字段引用的模板是静态字符串，渲染结果即模板本身，直接缓存
+        self._system_prerendered = (
+            prompts['system'] if len(self._system_segments) == 1 else None
+        )
+        self._user_prerendered = (
+            "" if self._user_segments is None
+            else (prompts['user'] if len(self._user_segments) == 1 else None)
+        )
+
         # 初始化组件
         self.model_client = ModelClient(
             model_config,
@@ -66,6 +203,24 @@ class Agent:
 
         self.validator = Validator(validation_config)
 
+        # 复用 HTTP 连接（keep-alive 连接池 + 重试）：同一主机的多张图像
+        # 下载共享 TCP/TLS 连接，省去逐张握手的开销
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+
+        # 预解析原图保存目录（output/<agent_name>-images/）；创建推迟到
+        # 首次保存时做一次，此后跳过重复的 mkdir 系统调用
+        self._images_dir = Path(
+            getattr(api_config, 'output_dir', None) or './output'
+        ) / f"{name}-images"
+        self._images_dir_ready = False
+
         logger.info(f"初始化 Agent: {name}, 类型: {agent_config.type}")
 
     def render_prompt(self, template: str, inputs: Dict[str, Any]) -> str:
@@ -79,20 +234,12 @@ class Agent:
         Returns:
             渲染后的 prompt
         """
-        def replace_field(match):
-            field_name = match.group(1)
-            value = inputs.get(field_name, f"{{{{不存在的字段: {field_name}}}}}")
-
-            # 如果值是列表或字典，转换为 JSON
-            if isinstance(value, (list, dict)):
-                return json.dumps(value, ensure_ascii=False, indent=2)
+        # 无字段引用的模板直接返回，跳过分词
+        if '{{' not in template:
+            return template
 
-            return str(value)
-
-        pattern = r'\{\{(\w+)\}\}'
-        rendered = re.sub(pattern, replace_field, template)
-
-        return rendered
+        # 分词后逐片段拼接：不再走 re.sub 的每匹配一次 C→Python 回调
+        return _render_segments(_compile_template(template), inputs)
 
     def prepare_input_data(
         self,
@@ -125,9 +272,12 @@ class Agent:
                 # 如果不是 JSON，直接作为文本
                 if self.agent_config.inputs:
                     # 如果定义了 inputs，需要 JSON 格式
+                    example_fields = ', '.join(
+                        f'"{field}": "..."' for field in self.agent_config.inputs
+                    )
                     raise ValueError(
                         f"输入格式不正确。期望 JSON 格式的输入，例如: "
-                        f"{{{', '.join([f'\"{field}\": \"...\"' for field in self.agent_config.inputs])}}}\n"
+                        f"{{{example_fields}}}\n"
                         f"实际收到: {input_str_or_dict[:100]}"
                     )
                 else:
@@ -142,169 +292,386 @@ class Agent:
 
         return input_data
 
+    def _download_original_image(self, image_url: str, save_path: Path) -> Path:
+        """
+        下载单张 URL 图像到本地
+
+        Args:
+            image_url: 图像 URL
+            save_path: 保存路径
+
+        Returns:
+            保存后的路径
+        """
+        logger.debug(f"下载原始图像: {image_url}")
+        # 流式下载，边收边写，避免把整个图像缓冲在内存里
+        response = self._http.get(image_url, timeout=30, stream=True)
+        response.raise_for_status()
+        # raw 是未解码的套接字流；让 urllib3 先解掉 gzip/deflate 等
+        # 传输编码，否则保存的"原图"会是压缩 blob
+        response.raw.decode_content = True
+        with open(save_path, 'wb', buffering=_COPY_BUFFER_SIZE) as f:
+            shutil.copyfileobj(response.raw, f, length=_COPY_BUFFER_SIZE)
+
+        logger.info(f"已保存 URL 图像: {save_path}")
+        return save_path
+
+    @staticmethod
+    def _copy_local_image(source_path: Path, save_path: Path):
+        """
+        把本地图像放到输出目录，尽量避免真正搬运字节
+
+        保存的原图只用于离线查看/核验，内容一致即可：优先硬链接
+        （零复制）；跨设备或文件系统不支持时回退 copy_file_range
+        （内核内直拷，CoW 文件系统上是 reflink）；再不行回退普通复制
+
+        Args:
+            source_path: 源文件路径
+            save_path: 目标路径
+        """
+        # 目标已存在时（同一秒内重名，或上次留下的硬链接）先删除：
+        # 若它与源共享 inode，直接以 'wb' 打开会把源文件一并截断
+        if save_path.exists():
+            try:
+                save_path.unlink()
+            except OSError:
+                pass
+
+        try:
+            os.link(source_path, save_path)
+            return
+        except OSError:
+            pass
+
+        src_stat = source_path.stat()
+        try:
+            with open(source_path, 'rb') as src, open(save_path, 'wb') as dst:
+                remaining = src_stat.st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        except (OSError, AttributeError):
+            # copy_file_range 不可用（非 Linux / 跨设备），走普通复制
+            if src_stat.st_size > _LARGE_COPY_THRESHOLD:
+                shutil.copyfile(source_path, save_path)
+                os.utime(save_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+            else:
+                shutil.copy2(source_path, save_path)
+            return
+
+        # 内核直拷成功后保留源文件时间戳
+        os.utime(save_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
     def _save_original_images(self, images: List[str]) -> List[str]:
         """
         保存原始图像到本地（用于离线查看/人工核验）
 
+        URL 图像通过线程池并发下载（下载是 I/O 密集操作，N 张图的
+        耗时约等于最慢一张而非逐张累加），本地文件直接复制。
+
         Args:
             images: 图像路径或 URL 列表
 
         Returns:
-            保存后的本地路径列表
+            保存后的本地路径列表（保持输入顺序，失败的条目跳过）
         """
-        from ..utils.config_loader import ConfigLoader
-
-        # 获取输出目录
-        output_dir = Path(self.api_config.output_dir if hasattr(self.api_config, 'output_dir') else './output')
+        # 图像保存目录已在构造时解析，只在首次保存时创建
+        images_dir = self._images_dir
+        if not self._images_dir_ready:
+            images_dir.mkdir(parents=True, exist_ok=True)
+            self._images_dir_ready = True
 
-        # 创建图像保存目录：output/<agent_name>-images/
-        images_dir = output_dir / f"{self.name}-images"
-        images_dir.mkdir(parents=True, exist_ok=True)
-
-        saved_paths = []
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # 先分流：URL 收集为下载任务，本地文件直接复制
+        save_paths: List[Optional[str]] = [None] * len(images)
+        url_tasks = []  # (下标, URL, 保存路径)
+
         for idx, image_path in enumerate(images):
-            try:
-                if self.image_processor.is_url(image_path):
-                    # URL 图像：下载原图
-                    logger.debug(f"下载原始图像: {image_path}")
-                    response = requests.get(image_path, timeout=30)
-                    response.raise_for_status()
-
-                    # 从 URL 推测文件扩展名
-                    from urllib.parse import urlparse
-                    parsed_url = urlparse(image_path)
-                    url_path = parsed_url.path
-                    ext = Path(url_path).suffix or '.jpg'
-
-                    # 保存文件
-                    filename = f"{timestamp}-{idx+1}{ext}"
-                    save_path = images_dir / filename
-                    save_path.write_bytes(response.content)
-
-                    logger.info(f"已保存 URL 图像: {save_path}")
-                else:
-                    # 本地文件：直接复制
-                    source_path = Path(image_path)
-                    if not source_path.exists():
-                        logger.warning(f"源图像不存在: {image_path}")
-                        continue
+            if self.image_processor.is_url(image_path):
+                # 从 URL 推测文件扩展名
+                ext = Path(urlparse(image_path).path).suffix or '.jpg'
+                save_path = images_dir / f"{timestamp}-{idx+1}{ext}"
+                url_tasks.append((idx, image_path, save_path))
+                continue
 
-                    filename = f"{timestamp}-{idx+1}{source_path.suffix}"
-                    save_path = images_dir / filename
-                    shutil.copy2(source_path, save_path)
+            # 本地文件：直接复制
+            try:
+                source_path = Path(image_path)
+                if not source_path.exists():
+                    logger.warning(f"源图像不存在: {image_path}")
+                    continue
 
-                    logger.info(f"已复制本地图像: {save_path}")
+                save_path = images_dir / f"{timestamp}-{idx+1}{source_path.suffix}"
+                self._copy_local_image(source_path, save_path)
 
-                saved_paths.append(str(save_path))
+                logger.info(f"已复制本地图像: {save_path}")
+                save_paths[idx] = str(save_path)
 
             except Exception as e:
                 logger.warning(f"保存原始图像失败 {image_path}: {e}")
-                continue
 
-        return saved_paths
+        # URL 图像并发下载
+        if url_tasks:
+            with ThreadPoolExecutor(max_workers=min(8, len(url_tasks))) as executor:
+                futures = {
+                    executor.submit(self._download_original_image, url, path): (idx, url)
+                    for idx, url, path in url_tasks
+                }
+                for future, (idx, url) in futures.items():
+                    try:
+                        save_paths[idx] = str(future.result())
+                    except Exception as e:
+                        logger.warning(f"保存原始图像失败 {url}: {e}")
+
+        return [p for p in save_paths if p is not None]
 
     def run(
         self,
         input_data: Dict[str, Any],
         images: Optional[List[str]] = None,
-        save_images: bool = False
+        save_images: bool = False,
+        stream_callback: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         执行 Agent
 
         Args:
             input_data: 输入数据字典
-            images: 图像路径列表（可选）
+            images: 图像路径列表，或已是 OpenAI Vision 格式的 dict 列表（可选）
             save_images: 是否保存原始图像到本地（用于离线查看/人工核验）
+            stream_callback: 流式输出回调（可选）。提供时走流式补全，
+                每收到一块增量文本调用一次；最终结果与非流式一致
 
         Returns:
             执行结果字典
         """
-        start_time = time.time()
+        # 用单调时钟计时（不受系统时间调整影响，整数运算也更便宜）
+        start_ns = time.perf_counter_ns()
 
+        # 无图像时直接引用 input_data（不复制）；仅在需要附加 images 时做一次浅拷贝
         result = {
             "agent": self.name,
             "timestamp": datetime.now().isoformat(),
-            "inputs": input_data.copy(),
+            "inputs": input_data,
             "status": "success"
         }
 
         try:
-            # 1. Prompt 模板验证
-            logger.info("步骤 1/5: 验证 Prompt 模板")
-            valid, missing_refs = self.validator.validate_prompt_templates(
-                self.agent_config,
-                self.prompts['system'],
-                self.prompts['user']
+            system_prompt, user_prompt, processed_images = self._prepare_call(
+                result, input_data, images, save_images
             )
-            if not valid:
-                raise ValueError(f"Prompt 模板验证失败，未引用字段: {missing_refs}")
-
-            # 2. 输入数据验证
-            logger.info("步骤 2/5: 验证输入数据")
-            valid, missing_fields = self.validator.validate_input_data(
-                self.agent_config,
-                input_data
-            )
-            if not valid:
-                raise ValueError(f"输入数据验证失败，缺少字段: {missing_fields}")
 
-            if missing_fields:
-                result['validation'] = {'missing_input_fields': missing_fields}
+            # 5. 调用模型
+            logger.info(f"步骤 5/5: 调用模型 {self.model_config.model}")
+            if stream_callback is not None:
+                # 流式：增量块先回调再累积（list + join，避免 O(n²) 字符串拼接）
+                chunks: List[str] = []
+                for chunk in self.model_client.call_stream(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    images=processed_images
+                ):
+                    chunks.append(chunk)
+                    stream_callback(chunk)
+                response = ''.join(chunks)
+            else:
+                response = self.model_client.call(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    images=processed_images
+                )
+
+            # 6. 验证输出
+            self._apply_response(result, response)
+
+        except Exception as e:
+            logger.error(f"Agent 执行失败: {e}")
+            result['status'] = 'error'
+            result['error'] = {
+                'type': type(e).__name__,
+                'message': str(e)
+            }
 
-            # 3. 处理图像（如果有）
-            processed_images = None
-            if images and len(images) > 0:
+        finally:
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
+            result['execution_time'] = execution_time
+            logger.info(f"Agent 执行完成，耗时: {execution_time:.2f}秒，状态: {result['status']}")
+
+        return result
+
+    def _prepare_call(
+        self,
+        result: Dict[str, Any],
+        input_data: Dict[str, Any],
+        images: Optional[List[str]],
+        save_images: bool
+    ):
+        """
+        模型调用前的公共步骤：验证、图像处理、渲染（run/arun 共用）
+
+        Returns:
+            (system_prompt, user_prompt, processed_images)
+        """
+        # 1. Prompt 模板验证（字段引用已在构造时提取）
+        logger.info("步骤 1/5: 验证 Prompt 模板")
+        valid, missing_refs = self.validator.validate_prompt_templates_precomputed(
+            self.agent_config,
+            self._referenced_fields
+        )
+        if not valid:
+            raise ValueError(f"Prompt 模板验证失败，未引用字段: {missing_refs}")
+
+        # 2. 输入数据验证
+        logger.info("步骤 2/5: 验证输入数据")
+        valid, missing_fields = self.validator.validate_input_data(
+            self.agent_config,
+            input_data
+        )
+        if not valid:
+            raise ValueError(f"输入数据验证失败，缺少字段: {missing_fields}")
+
+        if missing_fields:
+            result['validation'] = {'missing_input_fields': missing_fields}
+
+        # 3. 处理图像（如果有）
+        processed_images = None
+        if images and len(images) > 0:
+            if all(type(x) is dict and x.get('type') == 'image_url' for x in images):
+                # 调用方已给出 Vision API 格式的 payload（批量服务预热
+                # 缓存等场景），直接透传，跳过整个处理管线
+                logger.info(f"步骤 3/5: 图像已是 API 格式，跳过处理（{len(images)} 张）")
+                processed_images = images
+                result['inputs'] = {**input_data, 'images': images}
+            else:
                 logger.info(f"步骤 3/5: 处理 {len(images)} 张图像")
                 # download_url 参数由 image_cache_enabled 控制
                 # cache_enabled=True: 下载并缓存 URL 图像
                 # cache_enabled=False: 直接使用 URL（不下载）
                 download_url = self.image_processor.cache_enabled
-                processed_images = self.image_processor.process_images(
-                    images,
+
+                # 同一图像出现多次（网格/重复 prompt 常见）只处理一次，
+                # 结果按原位置展开
+                unique_indices: Dict[Any, int] = {}
+                unique_images: List[str] = []
+                positions: List[int] = []
+                for image in images:
+                    key = self._image_identity(image)
+                    pos = unique_indices.get(key)
+                    if pos is None:
+                        pos = len(unique_images)
+                        unique_indices[key] = pos
+                        unique_images.append(image)
+                    positions.append(pos)
+
+                unique_processed = self.image_processor.process_images(
+                    unique_images,
                     download_url=download_url
                 )
-                result['inputs']['images'] = images
+                processed_images = [unique_processed[pos] for pos in positions]
+                result['inputs'] = {**input_data, 'images': images}
 
                 # 保存原始图像到本地（用于离线查看/人工核验）
                 if save_images:
                     saved_paths = self._save_original_images(images)
                     result['saved_images'] = saved_paths
                     logger.info(f"已保存 {len(saved_paths)} 张原始图像到本地")
-            else:
-                logger.info("步骤 3/5: 无图像输入，跳过")
+        else:
+            logger.info("步骤 3/5: 无图像输入，跳过")
+
+        # 4. 渲染 Prompts（静态模板直接用缓存结果，其余走专用渲染函数）
+        logger.info("步骤 4/5: 渲染 Prompts")
+        system_prompt = (
+            self._system_prerendered
+            if self._system_prerendered is not None
+            else self._render_system(input_data)
+        )
+        user_prompt = (
+            self._user_prerendered
+            if self._user_prerendered is not None
+            else self._render_user(input_data)
+        )
 
-            # 4. 渲染 Prompts
-            logger.info("步骤 4/5: 渲染 Prompts")
-            system_prompt = self.render_prompt(self.prompts['system'], input_data)
-            user_prompt = self.render_prompt(self.prompts['user'], input_data) if self.prompts['user'] else ""
+        return system_prompt, user_prompt, processed_images
 
-            # 5. 调用模型
+    def _image_identity(self, image: str):
+        """
+        图像去重键：URL 用字符串本身，本地文件用 (设备, inode, size, mtime)
+
+        inode 只在单个设备内唯一，必须连同 st_dev 一起才能跨文件系统
+        区分文件；无法 stat 的路径退回路径字符串（让后续处理正常报错）
+        """
+        if self.image_processor.is_url(image):
+            return image
+        try:
+            st = os.stat(image)
+        except OSError:
+            return image
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _apply_response(self, result: Dict[str, Any], response: str):
+        """模型调用后的公共步骤：输出验证与结果填充（run/arun 共用）"""
+        valid, missing_output_fields, parsed_output = self.validator.validate_output_data(
+            self.agent_config,
+            response
+        )
+
+        if parsed_output is not None:
+            result['outputs'] = parsed_output
+        else:
+            result['outputs'] = {"raw_response": response}
+
+        if missing_output_fields:
+            if 'validation' not in result:
+                result['validation'] = {}
+            result['validation']['missing_output_fields'] = missing_output_fields
+            result['status'] = 'partial_success'
+
+    async def arun(
+        self,
+        input_data: Dict[str, Any],
+        images: Optional[List[str]] = None,
+        save_images: bool = False
+    ) -> Dict[str, Any]:
+        """
+        异步执行 Agent（行为与 run 一致，模型调用走 AsyncOpenAI）
+
+        供事件循环内的调用方用 asyncio.gather 并发跑多个 Agent 请求
+
+        Args:
+            input_data: 输入数据字典
+            images: 图像路径列表，或已是 OpenAI Vision 格式的 dict 列表（可选）
+            save_images: 是否保存原始图像到本地
+
+        Returns:
+            执行结果字典
+        """
+        start_ns = time.perf_counter_ns()
+
+        result = {
+            "agent": self.name,
+            "timestamp": datetime.now().isoformat(),
+            "inputs": input_data,
+            "status": "success"
+        }
+
+        try:
+            system_prompt, user_prompt, processed_images = self._prepare_call(
+                result, input_data, images, save_images
+            )
+
+            # 5. 调用模型（异步）
             logger.info(f"步骤 5/5: 调用模型 {self.model_config.model}")
-            response = self.model_client.call(
+            response = await self.model_client.acall(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 images=processed_images
             )
 
             # 6. 验证输出
-            valid, missing_output_fields, parsed_output = self.validator.validate_output_data(
-                self.agent_config,
-                response
-            )
-
-            if parsed_output is not None:
-                result['outputs'] = parsed_output
-            else:
-                result['outputs'] = {"raw_response": response}
-
-            if missing_output_fields:
-                if 'validation' not in result:
-                    result['validation'] = {}
-                result['validation']['missing_output_fields'] = missing_output_fields
-                result['status'] = 'partial_success'
+            self._apply_response(result, response)
 
         except Exception as e:
             logger.error(f"Agent 执行失败: {e}")
@@ -315,8 +682,66 @@ class Agent:
             }
 
         finally:
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             result['execution_time'] = execution_time
             logger.info(f"Agent 执行完成，耗时: {execution_time:.2f}秒，状态: {result['status']}")
 
         return result
+
+    def run_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        images_list: Optional[List[Optional[List[str]]]] = None,
+        save_images: bool = False,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        并发执行一批输入
+
+        模型调用是网络 I/O（socket 等待会释放 GIL），线程池可以把 N 次
+        串行延迟压缩到约 ceil(N / max_concurrency) 次。单条失败不影响
+        其他条目，体现在对应结果的 status/error 字段中（与 run 一致）。
+
+        Args:
+            batch: 输入数据字典列表
+            images_list: 每条输入对应的图像列表（可选，长度须与 batch 一致）
+            save_images: 是否保存原始图像到本地
+            max_concurrency: 最大并发数
+
+        Returns:
+            与输入顺序一一对应的结果列表
+        """
+        if images_list is not None and len(images_list) != len(batch):
+            raise ValueError("images_list 长度必须与 batch 一致")
+
+        if not batch:
+            return []
+
+        logger.info(
+            f"批量执行 Agent: {self.name}, "
+            f"共 {len(batch)} 条, 并发 {min(max_concurrency, len(batch))}"
+        )
+
+        # 批量执行期间强制非交互验证：工作线程不能阻塞在 input() 上
+        # （非 TTY 下会挂死，多线程还会争抢同一个 stdin）。缺少字段的
+        # 条目以 NeedsUserConfirmation 记入该条结果的 error 字段
+        validation = self.validator.config
+        saved_interactive = validation.interactive
+        validation.interactive = False
+
+        try:
+            # OpenAI 客户端与图像处理器的缓存均为线程安全，线程间可共享
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batch))) as executor:
+                futures = [
+                    executor.submit(
+                        self.run,
+                        input_data,
+                        images=images_list[idx] if images_list else None,
+                        save_images=save_images
+                    )
+                    for idx, input_data in enumerate(batch)
+                ]
+                # run() 内部捕获所有异常并写入结果，这里 result() 不会抛出
+                return [future.result() for future in futures]
+        finally:
+            validation.interactive = saved_interactive
@@ -3,6 +3,7 @@ Agent 工厂
 
 创建和管理 Agent 实例
 """
+import threading
 from typing import Dict, Optional
 from loguru import logger
 
@@ -20,6 +21,8 @@ class AgentFactory:
         """
         self.config = config
         self._agent_cache: Dict[str, Agent] = {}
+        # 双重检查锁：线程化批量执行时同名 Agent 只构造一次
+        self._cache_lock = threading.Lock()
 
     def create_agent(self, agent_name: str, config_loader: ConfigLoader) -> Agent:
         """
@@ -35,10 +38,11 @@ class AgentFactory:
         Raises:
             ValueError: Agent 不存在或未启用
         """
-        # 检查缓存
-        if agent_name in self._agent_cache:
+        # 检查缓存（无锁快路径：dict 读取本身是原子的）
+        agent = self._agent_cache.get(agent_name)
+        if agent is not None:
             logger.debug(f"从缓存获取 Agent: {agent_name}")
-            return self._agent_cache[agent_name]
+            return agent
 
         # 检查 Agent 是否存在
         if agent_name not in self.config.agents:
@@ -54,29 +58,36 @@ class AgentFactory:
         if not agent_reg.enabled:
             raise ValueError(f"Agent '{agent_name}' 未启用")
 
-        # 加载 Agent 配置和 prompts
-        logger.info(f"创建 Agent: {agent_name}")
-        agent_config, prompts = config_loader.load_agent_config(agent_name)
-
-        # 获取模型配置
-        model_name = agent_reg.model_provider
-        if model_name not in self.config.models:
-            raise ValueError(f"模型 '{model_name}' 不存在")
-
-        model_config = self.config.models[model_name]
-
-        # 创建 Agent 实例
-        agent = Agent(
-            name=agent_name,
-            agent_config=agent_config,
-            prompts=prompts,
-            model_config=model_config,
-            validation_config=self.config.validation,
-            api_config=self.config.api
-        )
-
-        # 缓存
-        self._agent_cache[agent_name] = agent
+        with self._cache_lock:
+            # 双重检查：等锁期间其他线程可能已完成构造
+            agent = self._agent_cache.get(agent_name)
+            if agent is not None:
+                logger.debug(f"从缓存获取 Agent: {agent_name}")
+                return agent
+
+            # 加载 Agent 配置和 prompts
+            logger.info(f"创建 Agent: {agent_name}")
+            agent_config, prompts = config_loader.load_agent_config(agent_name)
+
+            # 获取模型配置
+            model_name = agent_reg.model_provider
+            if model_name not in self.config.models:
+                raise ValueError(f"模型 '{model_name}' 不存在")
+
+            model_config = self.config.models[model_name]
+
+            # 创建 Agent 实例
+            agent = Agent(
+                name=agent_name,
+                agent_config=agent_config,
+                prompts=prompts,
+                model_config=model_config,
+                validation_config=self.config.validation,
+                api_config=self.config.api
+            )
+
+            # 缓存
+            self._agent_cache[agent_name] = agent
 
         return agent
 
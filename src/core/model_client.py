@@ -4,9 +4,9 @@
 使用 OpenAI SDK 调用兼容 OpenAI API 的模型服务
 支持 LLM 和 VLM
 """
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Iterator, List, Dict, Any, Optional
+from openai import OpenAI, AsyncOpenAI
+from tenacity import retry, stop_after_attempt, wait_exponential, AsyncRetrying
 from loguru import logger
 
 from ..utils.config_loader import ModelConfig
@@ -34,18 +34,56 @@ class ModelClient:
         self.retry_delay = retry_delay
         self.timeout = timeout
 
-        # 初始化 OpenAI 客户端
+        # 初始化 OpenAI 客户端（同步 + 异步，供 call/acall 分别使用）
         self.client = OpenAI(
             api_key=self.config.api_key,
             base_url=self.config.api_base,
             timeout=timeout
         )
+        self.aclient = AsyncOpenAI(
+            api_key=self.config.api_key,
+            base_url=self.config.api_base,
+            timeout=timeout
+        )
 
         logger.debug(
             f"初始化模型客户端: {self.config.type}, "
             f"model={self.config.model}, api_base={self.config.api_base}"
         )
 
+    def _build_api_params(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """构建 chat.completions 请求参数（同步/异步调用共用）"""
+        api_params = {
+            "model": self.config.model,
+            "messages": messages,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+        }
+
+        # 添加额外的 API 参数（如 enable_thinking 等）
+        # 通过 extra_body 传递给底层 API（适用于自定义参数）
+        extra_params = self.config.get_extra_api_params()
+        if extra_params:
+            api_params["extra_body"] = extra_params
+            logger.debug(f"额外 API 参数（通过 extra_body）: {extra_params}")
+
+        return api_params
+
+    def _extract_content(self, response) -> str:
+        """提取响应文本并记录 token 使用情况（同步/异步调用共用）"""
+        content = response.choices[0].message.content
+
+        # 记录token使用情况（部分兼容服务返回 usage 为 null）
+        if getattr(response, 'usage', None) is not None:
+            logger.debug(
+                f"Token usage: "
+                f"prompt={response.usage.prompt_tokens}, "
+                f"completion={response.usage.completion_tokens}, "
+                f"total={response.usage.total_tokens}"
+            )
+
+        return content
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -62,40 +100,63 @@ class ModelClient:
             模型响应文本
         """
         try:
-            # 构建基础参数
-            api_params = {
-                "model": self.config.model,
-                "messages": messages,
-                "max_tokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-            }
-
-            # 添加额外的 API 参数（如 enable_thinking 等）
-            # 通过 extra_body 传递给底层 API（适用于自定义参数）
-            extra_params = self.config.get_extra_api_params()
-            if extra_params:
-                api_params["extra_body"] = extra_params
-                logger.debug(f"额外 API 参数（通过 extra_body）: {extra_params}")
-
-            response = self.client.chat.completions.create(**api_params)
-
-            content = response.choices[0].message.content
-
-            # 记录token使用情况
-            if hasattr(response, 'usage'):
-                logger.debug(
-                    f"Token usage: "
-                    f"prompt={response.usage.prompt_tokens}, "
-                    f"completion={response.usage.completion_tokens}, "
-                    f"total={response.usage.total_tokens}"
-                )
-
-            return content
+            response = self.client.chat.completions.create(
+                **self._build_api_params(messages)
+            )
+            return self._extract_content(response)
 
         except Exception as e:
             logger.error(f"API 调用失败: {e}")
             raise
 
+    async def _acall_api(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        异步调用 API（带重试），重试策略与 _call_api 一致
+
+        Args:
+            messages: 消息列表
+
+        Returns:
+            模型响应文本
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            reraise=True
+        ):
+            with attempt:
+                try:
+                    response = await self.aclient.chat.completions.create(
+                        **self._build_api_params(messages)
+                    )
+                    return self._extract_content(response)
+
+                except Exception as e:
+                    logger.error(f"API 调用失败: {e}")
+                    raise
+
+    def _build_messages(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """构建消息列表（有图像时按 Vision API 格式组装 user content）"""
+        if images:
+            user_content = [
+                {"type": "text", "text": user_prompt}
+            ]
+            user_content.extend(images)
+            return [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
+            ]
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
     def call_llm(
         self,
         system_prompt: str,
@@ -111,10 +172,7 @@ class ModelClient:
         Returns:
             模型响应
         """
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        messages = self._build_messages(system_prompt, user_prompt)
 
         logger.info(f"调用 LLM: {self.config.model}")
         logger.debug(f"System prompt 长度: {len(system_prompt)}")
@@ -140,15 +198,7 @@ class ModelClient:
             模型响应
         """
         # 构建 user content（文本 + 图像）
-        user_content = [
-            {"type": "text", "text": user_prompt}
-        ]
-        user_content.extend(images)
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content}
-        ]
+        messages = self._build_messages(system_prompt, user_prompt, images)
 
         logger.info(
             f"调用 VLM: {self.config.model}, "
@@ -187,3 +237,102 @@ class ModelClient:
         else:
             # 无图像，使用 LLM
             return self.call_llm(system_prompt, user_prompt)
+
+    def _call_api_stream(self, messages: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        流式调用 API，逐块产出响应文本
+
+        流式响应无法安全地中途重试，因此不走 tenacity；建立连接前的
+        失败由调用方处理
+
+        Args:
+            messages: 消息列表
+
+        Yields:
+            增量响应文本块
+        """
+        api_params = self._build_api_params(messages)
+        api_params["stream"] = True
+
+        try:
+            for chunk in self.client.chat.completions.create(**api_params):
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+
+        except Exception as e:
+            logger.error(f"API 调用失败: {e}")
+            raise
+
+    def call_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[str]:
+        """
+        流式通用调用接口（自动判断 LLM 或 VLM）
+
+        不等待完整补全即逐块产出文本，长生成场景可显著降低首字节延迟
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            images: 图像列表（可选，VLM 需要）
+
+        Yields:
+            增量响应文本块
+        """
+        if images and len(images) > 0:
+            if self.config.type != 'vlm':
+                logger.warning(
+                    f"模型类型为 '{self.config.type}'，但提供了图像输入。"
+                    f"将尝试作为 VLM 调用。"
+                )
+            logger.info(
+                f"调用 VLM（流式）: {self.config.model}, "
+                f"图像数量: {len(images)}"
+            )
+        else:
+            logger.info(f"调用 LLM（流式）: {self.config.model}")
+
+        yield from self._call_api_stream(
+            self._build_messages(system_prompt, user_prompt, images)
+        )
+
+    async def acall(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        异步通用调用接口（自动判断 LLM 或 VLM）
+
+        与 call 行为一致，供事件循环内的调用方并发发起多个补全请求
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            images: 图像列表（可选，VLM 需要）
+
+        Returns:
+            模型响应
+        """
+        if images and len(images) > 0:
+            if self.config.type != 'vlm':
+                logger.warning(
+                    f"模型类型为 '{self.config.type}'，但提供了图像输入。"
+                    f"将尝试作为 VLM 调用。"
+                )
+            logger.info(
+                f"调用 VLM: {self.config.model}, "
+                f"图像数量: {len(images)}"
+            )
+        else:
+            logger.info(f"调用 LLM: {self.config.model}")
+
+        return await self._acall_api(
+            self._build_messages(system_prompt, user_prompt, images)
+        )
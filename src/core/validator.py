@@ -13,6 +13,35 @@ from loguru import logger
 
 from ..utils.config_loader import AgentConfig, ValidationConfig
 
+# 预编译正则，避免每次验证/解析时重复编译
+_FIELD_RE = re.compile(r'\{\{(\w+)\}\}')
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*\n(.*?)\n```', re.DOTALL)
+
+# 优先使用 orjson 解析模型输出（Rust 实现，比标准库快数倍），未安装时回退
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需改动
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+class NeedsUserConfirmation(Exception):
+    """
+    输入缺少字段且当前不允许交互确认时抛出
+
+    非严格模式下缺少输入字段本可通过 input() 询问用户，但库模式/
+    线程化批量执行不能阻塞在终端上；配置 interactive=False 时改抛
+    此异常，把继续与否的决策交还调用方
+
+    Attributes:
+        missing: 缺失的字段列表
+    """
+
+    def __init__(self, missing: List[str]):
+        super().__init__(f"输入数据缺少必需字段，需要确认是否继续: {missing}")
+        self.missing = missing
+
 
 class Validator:
     """参数验证器"""
@@ -23,6 +52,21 @@ class Validator:
             validation_config: 验证配置
         """
         self.config = validation_config
+        # 按配置对象身份缓存的字段 frozenset：inputs/outputs 在 Agent
+        # 生命周期内不变，避免每次验证都重建临时 set
+        self._field_sets: Dict[int, Tuple[frozenset, frozenset]] = {}
+
+    def _get_field_sets(self, agent_config: AgentConfig) -> Tuple[frozenset, frozenset]:
+        """获取 (inputs, outputs) 字段集合（每个配置对象只构建一次）"""
+        key = id(agent_config)
+        entry = self._field_sets.get(key)
+        if entry is None:
+            entry = (
+                frozenset(agent_config.inputs),
+                frozenset(agent_config.outputs)
+            )
+            self._field_sets[key] = entry
+        return entry
 
     def validate_prompt_templates(
         self,
@@ -44,20 +88,43 @@ class Validator:
         if not self.config.prompt_template_validation:
             return True, []
 
-        if not agent_config.inputs:
-            # 没有定义 inputs，跳过验证
-            return True, []
-
-        required_fields = set(agent_config.inputs)
-
         # 从 prompts 中提取所有 {{field}} 引用
-        pattern = r'\{\{(\w+)\}\}'
         referenced_fields = set()
 
         for prompt in [system_prompt, user_prompt]:
             if prompt:
-                matches = re.findall(pattern, prompt)
-                referenced_fields.update(matches)
+                referenced_fields.update(_FIELD_RE.findall(prompt))
+
+        return self.validate_prompt_templates_precomputed(
+            agent_config, referenced_fields
+        )
+
+    def validate_prompt_templates_precomputed(
+        self,
+        agent_config: AgentConfig,
+        referenced_fields: set
+    ) -> Tuple[bool, List[str]]:
+        """
+        验证预提取的模板字段引用
+
+        模板在 Agent 生命周期内不变，调用方可在构造时提取一次引用集合，
+        每次验证只剩一个集合差运算，省去对 prompt 全文的正则扫描
+
+        Args:
+            agent_config: Agent 配置
+            referenced_fields: 模板中引用的字段集合
+
+        Returns:
+            (是否通过, 未引用的字段列表)
+        """
+        if not self.config.prompt_template_validation:
+            return True, []
+
+        if not agent_config.inputs:
+            # 没有定义 inputs，跳过验证
+            return True, []
+
+        required_fields, _ = self._get_field_sets(agent_config)
 
         # 检查是否所有输入字段都被引用
         missing_refs = required_fields - referenced_fields
@@ -94,20 +161,24 @@ class Validator:
             # 没有定义 inputs，跳过验证
             return True, []
 
-        required_fields = set(agent_config.inputs)
-        provided_fields = set(input_data.keys())
+        required_fields, _ = self._get_field_sets(agent_config)
 
-        missing_fields = required_fields - provided_fields
+        # frozenset 可直接与 dict keys 视图做差，无需物化临时 set
+        missing_fields = required_fields - input_data.keys()
 
         if missing_fields:
             print(f"❌ 错误: 输入数据缺少以下必需字段: {list(missing_fields)}")
             print(f"必需字段: {list(required_fields)}")
-            print(f"已提供字段: {list(provided_fields)}")
+            print(f"已提供字段: {list(input_data.keys())}")
 
             if self.config.input_strict:
                 logger.error("输入数据验证失败（strict 模式）")
                 return False, list(missing_fields)
 
+            if not self.config.interactive:
+                # 非交互模式下不能阻塞在 input() 上，交由调用方决策
+                raise NeedsUserConfirmation(list(missing_fields))
+
             # 询问用户是否继续
             try:
                 response = input("\n是否继续执行? (y/n): ").strip().lower()
@@ -156,14 +227,13 @@ class Validator:
                 return False, list(agent_config.outputs), None
             return True, list(agent_config.outputs), None
 
-        required_fields = set(agent_config.outputs)
-        provided_fields = set(parsed_output.keys())
-        missing_fields = required_fields - provided_fields
+        _, required_fields = self._get_field_sets(agent_config)
+        missing_fields = required_fields - parsed_output.keys()
 
         if missing_fields:
             logger.warning(f"⚠️  Agent 输出缺少以下字段: {list(missing_fields)}")
             logger.warning(f"期望字段: {list(required_fields)}")
-            logger.warning(f"实际字段: {list(provided_fields)}")
+            logger.warning(f"实际字段: {list(parsed_output.keys())}")
 
             if self.config.output_strict:
                 logger.error("输出数据验证失败（strict 模式）")
@@ -195,7 +265,7 @@ class Validator:
             # 尝试解析 JSON
             try:
                 # 尝试直接解析
-                parsed = json.loads(output_data)
+                parsed = _json_loads(output_data)
                 if isinstance(parsed, dict):
                     return parsed
             except json.JSONDecodeError:
@@ -204,10 +274,9 @@ class Validator:
             # 尝试提取 JSON（可能在 markdown 代码块中）
             try:
                 # 匹配 ```json ... ``` 或 ``` ... ```
-                json_pattern = r'```(?:json)?\s*\n(.*?)\n```'
-                matches = re.findall(json_pattern, output_data, re.DOTALL)
+                matches = _JSON_BLOCK_RE.findall(output_data)
                 if matches:
-                    parsed = json.loads(matches[0])
+                    parsed = _json_loads(matches[0])
                     if isinstance(parsed, dict):
                         return parsed
             except json.JSONDecodeError:
@@ -2,11 +2,16 @@
 输出格式化器基类
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, TextIO
 
 
 class BaseFormatter(ABC):
-    """输出格式化器基类"""
+    """
+    输出格式化器基类
+
+    实现必须是无状态的（构造参数除外）：FormatterFactory 会按格式类型
+    缓存实例并在多次调用甚至多线程间复用
+    """
 
     @abstractmethod
     def format(self, result: Dict[str, Any]) -> str:
@@ -21,6 +26,19 @@ class BaseFormatter(ABC):
         """
         pass
 
+    def stream(self, result: Dict[str, Any], fp: TextIO):
+        """
+        将结果直接序列化写入已打开的文件对象
+
+        默认实现复用 format()；支持流式序列化的子类可覆盖此方法，
+        避免在内存中构建完整的中间字符串
+
+        Args:
+            result: 执行结果字典
+            fp: 已打开的文本文件对象
+        """
+        fp.write(self.format(result))
+
     @abstractmethod
     def get_extension(self) -> str:
         """
@@ -22,6 +22,9 @@ class FormatterFactory:
         'markdown': MarkdownFormatter,
     }
 
+    # 按格式类型缓存的单例（格式化器无每次调用状态，见 BaseFormatter）
+    _instances: Dict[str, BaseFormatter] = {}
+
     @classmethod
     def create(cls, format_type: str) -> BaseFormatter:
         """
@@ -45,7 +48,11 @@ class FormatterFactory:
                 f"支持的格式: {supported}"
             )
 
-        return cls._formatters[format_type]()
+        instance = cls._instances.get(format_type)
+        if instance is None:
+            instance = cls._formatters[format_type]()
+            cls._instances[format_type] = instance
+        return instance
 
     @classmethod
     def get_supported_formats(cls) -> list[str]:
@@ -61,4 +68,7 @@ class FormatterFactory:
             format_type: 格式类型
             formatter_class: 格式化器类
         """
-        cls._formatters[format_type.lower()] = formatter_class
+        format_type = format_type.lower()
+        cls._formatters[format_type] = formatter_class
+        # 丢弃旧实例，避免覆盖注册后仍返回旧类型
+        cls._instances.pop(format_type, None)
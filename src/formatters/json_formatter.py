@@ -5,6 +5,12 @@ import json
 from typing import Dict, Any
 from .base import BaseFormatter
 
+# 优先使用 orjson 序列化（Rust 实现，比标准库快数倍），未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JSONFormatter(BaseFormatter):
     """JSON 格式化器"""
@@ -18,8 +24,26 @@ class JSONFormatter(BaseFormatter):
 
     def format(self, result: Dict[str, Any]) -> str:
         """格式化为 JSON"""
+        # orjson 仅支持 2 空格缩进，其他缩进配置走标准库；
+        # OPT_NON_STR_KEYS：YAML 输入可能带非字符串键（如 `1: one`），
+        # 与标准库一样把键转成字符串而不是抛 TypeError
+        if orjson is not None and self.indent == 2:
+            return orjson.dumps(
+                result,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str
+            ).decode('utf-8')
+
         return json.dumps(result, ensure_ascii=False, indent=self.indent)
 
+    def stream(self, result: Dict[str, Any], fp):
+        """流式写入 JSON（标准库路径用 json.dump 直接写文件，省去中间字符串）"""
+        if orjson is not None and self.indent == 2:
+            fp.write(self.format(result))
+            return
+
+        json.dump(result, fp, ensure_ascii=False, indent=self.indent)
+
     def get_extension(self) -> str:
         """返回扩展名"""
         return "json"
@@ -1,9 +1,89 @@
 """
 Markdown 格式化器
 """
+import json
 from typing import Dict, Any
 from .base import BaseFormatter
 
+# 优先使用 orjson 序列化结构化输出值（Rust 实现，嵌套字典快 5-10 倍），
+# 未安装时回退标准库；两者输出均为 2 空格缩进、不转义非 ASCII。
+# OPT_NON_STR_KEYS：YAML 输入可能带非字符串键，与标准库一样转成字符串
+try:
+    import orjson
+
+    def _json_dumps(value):
+        return orjson.dumps(
+            value,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ).decode('utf-8')
+except ImportError:
+    def _json_dumps(value):
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def _is_multiline(s: str, _limit: int = 200) -> bool:
+    """
+    判断字符串是否包含换行
+
+    先在前 _limit 个字符内做有界查找（C 级 memchr，典型的短标签值立即
+    返回），未命中且字符串更长时再扫描剩余部分，结果与 '\\n' in s 一致
+    """
+    if s.find('\n', 0, _limit) != -1:
+        return True
+    return len(s) > _limit and s.find('\n', _limit) != -1
+
+
+def _render_input_value(append, key, value):
+    """渲染单个输入字段（列表转条目、多行文本转代码块、其余内联）"""
+    # 值来自 JSON/YAML 解析，都是精确类型，type() 比 isinstance 快
+    t = type(value)
+    if t is list:
+        append(f"### {key}")
+        append("")
+        for item in value:
+            append(f"- {item}")
+        append("")
+    elif t is str and _is_multiline(value):
+        # 多行文本使用代码块
+        append(f"### {key}")
+        append("")
+        append("```")
+        append(value)
+        append("```")
+        append("")
+    else:
+        append(f"**{key}**: {value}")
+        append("")
+
+
+def _render_output_value(append, key, value):
+    """渲染单个输出字段（结构化数据转 JSON 块、多行文本展开、其余内联）"""
+    t = type(value)
+    if t is list or t is dict:
+        append(f"### {key}")
+        append("")
+        append("```json")
+        append(_json_dumps(value))
+        append("```")
+        append("")
+    elif t is str and _is_multiline(value):
+        # 多行文本
+        append(f"### {key}")
+        append("")
+        append(value)
+        append("")
+    else:
+        append(f"**{key}**: {value}")
+        append("")
+
+
+# 节 -> (标题, 字段渲染函数)：format 只查表迭代，不再走长 if/elif 链
+_SECTIONS = (
+    ('inputs', '## 输入数据', _render_input_value),
+    ('outputs', '## 输出结果', _render_output_value),
+)
+
 
 class MarkdownFormatter(BaseFormatter):
     """Markdown 格式化器 - 适合文档和报告"""
@@ -11,88 +91,72 @@ class MarkdownFormatter(BaseFormatter):
     def format(self, result: Dict[str, Any]) -> str:
         """格式化为 Markdown"""
         lines = []
+        # 绑定一次 append，省去循环内的属性查找；行内不再携带结尾
+        # 换行符，空行统一用空字符串表示，由最后的 join 插入分隔符
+        append = lines.append
 
         # 标题
         agent_name = result.get('agent', 'Agent')
-        lines.append(f"# {agent_name} 执行结果\n")
+        append(f"# {agent_name} 执行结果")
+        append("")
 
         # 基本信息
-        lines.append("## 基本信息\n")
-        lines.append(f"- **状态**: {result.get('status', 'N/A')}")
-        lines.append(f"- **时间**: {result.get('timestamp', 'N/A')}")
+        append("## 基本信息")
+        append("")
+        append(f"- **状态**: {result.get('status', 'N/A')}")
+        append(f"- **时间**: {result.get('timestamp', 'N/A')}")
 
         if 'execution_time' in result:
-            lines.append(f"- **耗时**: {result['execution_time']:.2f} 秒")
-
-        lines.append("")
-
-        # 输入数据
-        if 'inputs' in result:
-            lines.append("## 输入数据\n")
-            inputs = result['inputs']
-            if isinstance(inputs, dict):
-                for key, value in inputs.items():
-                    if isinstance(value, list):
-                        lines.append(f"### {key}\n")
-                        for item in value:
-                            lines.append(f"- {item}")
-                        lines.append("")
-                    elif isinstance(value, str) and '\n' in value:
-                        # 多行文本使用代码块
-                        lines.append(f"### {key}\n")
-                        lines.append("```")
-                        lines.append(value)
-                        lines.append("```\n")
-                    else:
-                        lines.append(f"**{key}**: {value}\n")
-            else:
-                lines.append(f"```\n{inputs}\n```\n")
-
-        # 输出数据
-        if 'outputs' in result:
-            lines.append("## 输出结果\n")
-            outputs = result['outputs']
-            if isinstance(outputs, dict):
-                for key, value in outputs.items():
-                    if isinstance(value, (list, dict)):
-                        lines.append(f"### {key}\n")
-                        lines.append("```json")
-                        import json
-                        lines.append(json.dumps(value, ensure_ascii=False, indent=2))
-                        lines.append("```\n")
-                    elif isinstance(value, str) and '\n' in value:
-                        # 多行文本
-                        lines.append(f"### {key}\n")
-                        lines.append(value)
-                        lines.append("")
-                    else:
-                        lines.append(f"**{key}**: {value}\n")
+            append(f"- **耗时**: {result['execution_time']:.2f} 秒")
+
+        append("")
+
+        # 输入/输出数据（查表渲染）
+        for section_key, header, render_value in _SECTIONS:
+            if section_key not in result:
+                continue
+
+            append(header)
+            append("")
+            section = result[section_key]
+            if type(section) is dict:
+                for key, value in section.items():
+                    render_value(append, key, value)
             else:
-                lines.append(f"```\n{outputs}\n```\n")
+                append("```")
+                append(f"{section}")
+                append("```")
+                append("")
 
         # 验证信息
         if 'validation' in result:
-            lines.append("## 验证信息\n")
+            append("## 验证信息")
+            append("")
             validation = result['validation']
-            if isinstance(validation, dict):
+            if type(validation) is dict:
                 for key, value in validation.items():
-                    lines.append(f"- **{key}**: {value}")
-            lines.append("")
+                    append(f"- **{key}**: {value}")
+            append("")
 
         # 错误信息
         if 'error' in result:
-            lines.append("## ⚠️ 错误信息\n")
+            append("## ⚠️ 错误信息")
+            append("")
             error = result['error']
-            if isinstance(error, dict):
-                lines.append(f"**类型**: `{error.get('type', 'N/A')}`\n")
-                lines.append(f"**消息**: {error.get('message', 'N/A')}\n")
+            if type(error) is dict:
+                append(f"**类型**: `{error.get('type', 'N/A')}`")
+                append("")
+                append(f"**消息**: {error.get('message', 'N/A')}")
+                append("")
                 if 'details' in error:
-                    lines.append("**详情**:")
-                    lines.append("```")
-                    lines.append(error['details'])
-                    lines.append("```")
+                    append("**详情**:")
+                    append("```")
+                    append(error['details'])
+                    append("```")
             else:
-                lines.append(f"```\n{error}\n```")
+                append("```")
+                append(f"{error}")
+                append("```")
 
         return "\n".join(lines)
 
@@ -5,74 +5,87 @@ from typing import Dict, Any
 from .base import BaseFormatter
 
 
+def _render_input_value(append, key, value):
+    """渲染单个输入字段（列表转条目，其余内联）"""
+    # 值来自 JSON/YAML 解析，都是精确类型，type() 比 isinstance 快
+    if type(value) is list:
+        append(f"{key}:")
+        for item in value:
+            append(f"  - {item}")
+    else:
+        append(f"{key}: {value}")
+
+
+def _render_output_value(append, key, value):
+    """渲染单个输出字段（结构化数据缩进展示，其余内联）"""
+    t = type(value)
+    if t is list or t is dict:
+        append(f"{key}:")
+        append(f"  {value}")
+    else:
+        append(f"{key}: {value}")
+
+
+# 节 -> (标题, 字段渲染函数)：format 只查表迭代，不再走长 if/elif 链
+_SECTIONS = (
+    ('inputs', '=== Inputs ===', _render_input_value),
+    ('outputs', '=== Outputs ===', _render_output_value),
+)
+
+
 class TXTFormatter(BaseFormatter):
     """TXT 格式化器 - 人类可读的文本格式"""
 
     def format(self, result: Dict[str, Any]) -> str:
         """格式化为 TXT"""
         lines = []
+        # 绑定一次 append，省去循环内的属性查找
+        append = lines.append
 
         # 基本信息
-        lines.append(f"Agent: {result.get('agent', 'N/A')}")
-        lines.append(f"Timestamp: {result.get('timestamp', 'N/A')}")
-        lines.append(f"Status: {result.get('status', 'N/A')}")
+        append(f"Agent: {result.get('agent', 'N/A')}")
+        append(f"Timestamp: {result.get('timestamp', 'N/A')}")
+        append(f"Status: {result.get('status', 'N/A')}")
 
         if 'execution_time' in result:
-            lines.append(f"Execution Time: {result['execution_time']:.2f}s")
-
-        lines.append("")
-
-        # 输入数据
-        if 'inputs' in result:
-            lines.append("=== Inputs ===")
-            inputs = result['inputs']
-            if isinstance(inputs, dict):
-                for key, value in inputs.items():
-                    if isinstance(value, list):
-                        lines.append(f"{key}:")
-                        for item in value:
-                            lines.append(f"  - {item}")
-                    else:
-                        lines.append(f"{key}: {value}")
-            else:
-                lines.append(str(inputs))
-            lines.append("")
-
-        # 输出数据
-        if 'outputs' in result:
-            lines.append("=== Outputs ===")
-            outputs = result['outputs']
-            if isinstance(outputs, dict):
-                for key, value in outputs.items():
-                    if isinstance(value, (list, dict)):
-                        lines.append(f"{key}:")
-                        lines.append(f"  {value}")
-                    else:
-                        lines.append(f"{key}: {value}")
+            append(f"Execution Time: {result['execution_time']:.2f}s")
+
+        append("")
+
+        # 输入/输出数据（查表渲染）
+        for section_key, header, render_value in _SECTIONS:
+            if section_key not in result:
+                continue
+
+            append(header)
+            section = result[section_key]
+            if type(section) is dict:
+                for key, value in section.items():
+                    render_value(append, key, value)
             else:
-                lines.append(str(outputs))
-            lines.append("")
+                append(str(section))
+            append("")
 
         # 验证信息
         if 'validation' in result:
-            lines.append("=== Validation ===")
+            append("=== Validation ===")
             validation = result['validation']
-            if isinstance(validation, dict):
+            if type(validation) is dict:
                 for key, value in validation.items():
-                    lines.append(f"{key}: {value}")
-            lines.append("")
+                    append(f"{key}: {value}")
+            append("")
 
         # 错误信息
         if 'error' in result:
-            lines.append("=== Error ===")
+            append("=== Error ===")
             error = result['error']
-            if isinstance(error, dict):
-                lines.append(f"Type: {error.get('type', 'N/A')}")
-                lines.append(f"Message: {error.get('message', 'N/A')}")
+            if type(error) is dict:
+                append(f"Type: {error.get('type', 'N/A')}")
+                append(f"Message: {error.get('message', 'N/A')}")
                 if 'details' in error:
-                    lines.append(f"Details: {error['details']}")
+                    append(f"Details: {error['details']}")
             else:
-                lines.append(str(error))
+                append(str(error))
 
         return "\n".join(lines)
 
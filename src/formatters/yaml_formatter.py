@@ -5,6 +5,40 @@ import yaml
 from typing import Dict, Any
 from .base import BaseFormatter
 
+# 优先使用 libyaml 的 C 实现（纯 Python emitter 往往慢 5-10 倍），未编译时回退
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+
+def _normalize(value: Any) -> Any:
+    """
+    把结果树展平为纯内置类型
+
+    C dumper 只对内置 dict/list/标量走快速表示路径，遇到 Pydantic 模型
+    等对象要么走 Python 级 represent 链要么直接报错；先统一转成字典/
+    字符串，让整个 emit 过程都留在 C 里
+    """
+    t = type(value)
+    if t is dict:
+        return {k: _normalize(v) for k, v in value.items()}
+    if t is list or t is tuple:
+        return [_normalize(v) for v in value]
+    if t is str or t is int or t is float or t is bool or value is None:
+        return value
+
+    # Pydantic 模型（v2 / v1）转为字典
+    if hasattr(value, 'model_dump'):
+        return _normalize(value.model_dump())
+    if hasattr(value, 'dict'):
+        try:
+            return _normalize(value.dict())
+        except TypeError:
+            pass
+
+    return str(value)
+
 
 class YAMLFormatter(BaseFormatter):
     """YAML 格式化器"""
@@ -19,7 +53,19 @@ class YAMLFormatter(BaseFormatter):
     def format(self, result: Dict[str, Any]) -> str:
         """格式化为 YAML"""
         return yaml.dump(
-            result,
+            _normalize(result),
+            Dumper=_Dumper,
+            allow_unicode=True,
+            default_flow_style=self.default_flow_style,
+            sort_keys=False
+        )
+
+    def stream(self, result: Dict[str, Any], fp):
+        """流式写入 YAML（yaml.dump 边序列化边写文件，省去中间字符串）"""
+        yaml.dump(
+            _normalize(result),
+            fp,
+            Dumper=_Dumper,
             allow_unicode=True,
             default_flow_style=self.default_flow_style,
             sort_keys=False
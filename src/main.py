@@ -3,12 +3,12 @@ Simple AI Agents - 主程序入口
 
 一个轻量级的 AI Agent 工厂框架
 """
+import os
 import sys
 import click
-from pathlib import Path
 
-# 添加项目根目录到 Python 路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# 添加项目根目录到 Python 路径（os.path 字符串运算，避免构造 Path 对象）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.config_loader import ConfigLoader
 from src.utils.logger import setup_logger
@@ -20,10 +20,11 @@ from src.cli.commands import Commands
 @click.pass_context
 def cli(ctx, config):
     """Simple AI Agents - AI Agent 工厂框架"""
-    # 确定配置文件路径
+    # 确定配置文件路径（显式指定 --config 时完全跳过本地配置探测）
     if config is None:
-        # 未指定配置文件，按优先级查找
-        if Path('config.local.yaml').exists():
+        # 未指定配置文件，按优先级查找（os.path.exists 是一次 C 级 stat，
+        # 不经过 PurePath 包装）
+        if os.path.exists('config.local.yaml'):
             config = 'config.local.yaml'
             click.echo(f"使用本地配置: {config}")
         else:
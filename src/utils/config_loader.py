@@ -6,22 +6,130 @@
 """
 import os
 import json
+import pickle
 import re
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional, Tuple
 import yaml
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 from loguru import logger
 
+# 优先使用 libyaml 的 C 实现解析配置（比纯 Python 快一个数量级），未编译时回退
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# 预编译环境变量替换正则（expand_env_vars 会对配置树的每个字符串叶子调用），
+# 并绑定 sub 方法省去每次的属性查找
+_ENV_RE = re.compile(r'\$\{([^}:]+)(?::(-)?([^}]*))?\}')
+_ENV_SUB = _ENV_RE.sub
+
+# 模块级绑定，省去每次替换的属性查找；os.environ 的 get 还会对键做编码
+_environ_get = os.environ.get
+_ENV_MISSING = object()
+
+# 跨进程的 agent 配置缓存：CLI 每次调用都是新进程，pickle 反序列化比
+# 重新解析 JSON + prompt 文件快得多；缓存按文件 mtime 校验，修改后自动失效
+_AGENT_CACHE_PATH = Path.home() / '.cache' / 'simple-ai' / 'config.pkl'
+
+
+def _load_agent_disk_cache() -> Dict[str, Any]:
+    """读取磁盘上的 agent 配置缓存，损坏或不存在时返回空字典"""
+    try:
+        with open(_AGENT_CACHE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError):
+        return {}
+
+
+def _save_agent_disk_cache(cache: Dict[str, Any]):
+    """原子写入 agent 配置缓存（写临时文件后 rename），失败时静默跳过"""
+    try:
+        _AGENT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(_AGENT_CACHE_PATH.parent), suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _AGENT_CACHE_PATH)
+    except (OSError, pickle.PickleError) as e:
+        logger.debug(f"写入配置缓存失败: {e}")
+
+
+def _expand_string(value: str, strict: bool, env_cache: Optional[dict] = None) -> str:
+    """
+    替换单个字符串中的 ${VAR} / ${VAR:-default} 引用
+
+    Args:
+        value: 待替换的字符串
+        strict: 严格模式。True=缺少环境变量时报错，False=保留原样
+        env_cache: 单次展开内的环境变量查询缓存（同一变量在多个模型配置
+            中反复出现时只查一次 os.environ）
+    """
+    # 绝大多数配置字符串不含环境变量引用，一次 in 检查即可跳过整套正则
+    if '${' not in value:
+        return value
+
+    def replace_env(match):
+        var_name = match.group(1)
+        has_default = match.group(2) is not None
+        default_value = match.group(3) if has_default else None
+
+        if env_cache is None:
+            env_value = _environ_get(var_name)
+        else:
+            env_value = env_cache.get(var_name, _ENV_MISSING)
+            if env_value is _ENV_MISSING:
+                env_value = _environ_get(var_name)
+                env_cache[var_name] = env_value
+
+        if env_value is not None:
+            return env_value
+        elif has_default:
+            return default_value or ""
+        else:
+            if strict:
+                raise ValueError(
+                    f"环境变量 '{var_name}' 未设置且没有提供默认值。"
+                    f"请设置环境变量或使用 ${{VAR:-default}} 语法提供默认值。"
+                )
+            else:
+                # 非严格模式，保留原样
+                return match.group(0)
+
+    return _ENV_SUB(replace_env, value)
+
+
+def _needs_expand(value: Any) -> bool:
+    """检查配置树中是否存在含 ${ 的字符串叶子（有才值得做展开+重建）"""
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        t = type(node)
+        if t is str:
+            if '${' in node:
+                return True
+        elif t is dict:
+            stack.extend(node.values())
+        elif t is list:
+            stack.extend(node)
+    return False
+
 
 def expand_env_vars(value: Any, strict: bool = True) -> Any:
     """
-    递归替换配置中的环境变量
+    替换配置中的环境变量
 
     支持的格式：
     - ${ENV_VAR}: 使用环境变量，如果不存在则报错（strict=True）或保留原样（strict=False）
     - ${ENV_VAR:-default}: 使用环境变量，如果不存在则使用默认值
 
+    遍历用显式栈迭代完成（配置树可能有上千个叶子节点，逐节点递归的
+    Python 函数调用开销可观）；传入的 dict/list 会被原地修改并返回。
+    目前所有调用方传入的都是 yaml.load / pydantic .dict() 新建的树。
+
     Args:
         value: 要处理的值
         strict: 严格模式。True=缺少环境变量时报错，False=保留原样等待后续验证
@@ -30,49 +138,40 @@ def expand_env_vars(value: Any, strict: bool = True) -> Any:
         api_key: ${OPENAI_API_KEY}
         api_base: ${API_BASE:-http://localhost:8000}
     """
-    if isinstance(value, str):
-        # 匹配 ${VAR} 或 ${VAR:-default}
-        pattern = r'\$\{([^}:]+)(?::(-)?([^}]*))?\}'
-
-        def replace_env(match):
-            var_name = match.group(1)
-            has_default = match.group(2) is not None
-            default_value = match.group(3) if has_default else None
-
-            env_value = os.environ.get(var_name)
-
-            if env_value is not None:
-                return env_value
-            elif has_default:
-                return default_value or ""
-            else:
-                if strict:
-                    raise ValueError(
-                        f"环境变量 '{var_name}' 未设置且没有提供默认值。"
-                        f"请设置环境变量或使用 ${{VAR:-default}} 语法提供默认值。"
-                    )
-                else:
-                    # 非严格模式，保留原样
-                    return match.group(0)
-
-        return re.sub(pattern, replace_env, value)
-
-    elif isinstance(value, dict):
-        return {k: expand_env_vars(v, strict) for k, v in value.items()}
-
-    elif isinstance(value, list):
-        return [expand_env_vars(item, strict) for item in value]
-
-    else:
+    # 配置树来自 YAML 解析 / pydantic .dict()，节点都是精确类型，
+    # type() 比 isinstance 快
+    t = type(value)
+    if t is str:
+        return _expand_string(value, strict)
+    if t is not dict and t is not list:
         return value
 
+    env_cache: dict = {}
+    stack = [value]
+    while stack:
+        container = stack.pop()
+        items = (
+            container.items() if type(container) is dict
+            else enumerate(container)
+        )
+        for key, child in items:
+            ct = type(child)
+            if ct is str:
+                if '${' in child:
+                    container[key] = _expand_string(child, strict, env_cache)
+            elif ct is dict or ct is list:
+                stack.append(child)
+
+    return value
+
 
 class ModelConfig(BaseModel):
     """模型配置"""
     class Config:
         extra = 'allow'  # 允许额外字段（用于 API 参数）
 
-    type: str = Field(..., description="模型类型: llm 或 vlm")
+    # Literal 由 pydantic 核心做成员检查，无需 Python 级 validator 回调
+    type: Literal['llm', 'vlm'] = Field(..., description="模型类型: llm 或 vlm")
     api_base: str = Field(..., description="API 基础 URL")
     api_key: str = Field(..., description="API Key")
     model: str = Field(..., description="模型名称")
@@ -89,12 +188,6 @@ class ModelConfig(BaseModel):
     image_cache_enabled: bool = Field(default=False, description="是否启用图像缓存")
     image_cache_ttl: int = Field(default=86400, description="缓存过期时间（秒）")
 
-    @validator('type')
-    def validate_type(cls, v):
-        if v not in ['llm', 'vlm']:
-            raise ValueError(f"模型类型必须是 'llm' 或 'vlm', 但得到: {v}")
-        return v
-
     def get_extra_api_params(self) -> dict:
         """获取额外的 API 参数（排除已知字段）"""
         known_fields = {
@@ -121,18 +214,12 @@ class AgentRegistration(BaseModel):
 
 class AgentConfig(BaseModel):
     """Agent 配置（来自 config/agents/*/config.json）"""
-    type: str = Field(..., description="Agent 类型: llm 或 vlm")
+    type: Literal['llm', 'vlm'] = Field(..., description="Agent 类型: llm 或 vlm")
     inputs: list[str] = Field(default_factory=list, description="输入参数列表")
     outputs: list[str] = Field(default_factory=list, description="输出字段列表")
     system_prompt: str = Field(..., description="system prompt 文件路径")
     user_prompt: Optional[str] = Field(None, description="user prompt 文件路径")
 
-    @validator('type')
-    def validate_type(cls, v):
-        if v not in ['llm', 'vlm']:
-            raise ValueError(f"Agent 类型必须是 'llm' 或 'vlm', 但得到: {v}")
-        return v
-
 
 class ValidationConfig(BaseModel):
     """验证配置"""
@@ -143,6 +230,9 @@ class ValidationConfig(BaseModel):
     output_validation: bool = True
     output_strict: bool = False
     output_fill_missing: bool = True
+    # 非严格模式下缺少输入字段时是否允许 input() 交互确认；
+    # False 时改为抛出 NeedsUserConfirmation（库模式/批量执行不可阻塞）
+    interactive: bool = True
 
 
 class APIConfig(BaseModel):
@@ -176,49 +266,138 @@ class Config(BaseModel):
 class ConfigLoader:
     """配置加载器"""
 
+    # 进程内共享的磁盘缓存内容（首次访问时加载）
+    _disk_cache: Optional[Dict[str, Any]] = None
+
+    # 进程内的文本文件缓存（按路径键、mtime 校验）：开发循环中反复加载
+    # 同一 agent 时跳过 open/read/decode
+    _text_cache: Dict[str, Tuple[int, str]] = {}
+
+    @classmethod
+    def _read_text_cached(cls, path: Path) -> Tuple[str, int]:
+        """
+        读取文本文件（Path.read_text 一次完成 打开/读取/解码）并缓存
+
+        Returns:
+            (文件内容, mtime_ns)
+        """
+        key = str(path)
+        mtime_ns = path.stat().st_mtime_ns
+        cached = cls._text_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], mtime_ns
+
+        text = path.read_text(encoding='utf-8')
+        cls._text_cache[key] = (mtime_ns, text)
+        return text, mtime_ns
+
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = Path(config_path)
         self.config: Optional[Config] = None
+        self._config_mtime_ns: Optional[int] = None
         self.agent_configs: Dict[str, AgentConfig] = {}
         self.agent_prompts: Dict[str, Dict[str, str]] = {}
+        # 已加载 agent 相关文件（config.json 与 prompt 文件）的 mtime：
+        # load_agent_config 重复调用时校验全部文件未变化才命中进程内缓存
+        self._agent_stamps: Dict[str, Dict[str, int]] = {}
+        # 已完成环境变量展开和严格验证的模型配置（按名称缓存；进程内
+        # 环境变量视为不变，重复获取同一模型时跳过整个展开+重建管线）
+        self._resolved_models: Dict[str, ModelConfig] = {}
+
+    @classmethod
+    def _get_disk_cache(cls) -> Dict[str, Any]:
+        """获取磁盘缓存内容（进程内只读取一次）"""
+        if cls._disk_cache is None:
+            cls._disk_cache = _load_agent_disk_cache()
+        return cls._disk_cache
+
+    @staticmethod
+    def _stamps_unchanged(stamps: Dict[str, int]) -> bool:
+        """检查一组文件的 mtime 是否全部未变化（文件缺失/不可读视为变化）"""
+        try:
+            for path_str, mtime_ns in stamps.items():
+                if os.stat(path_str).st_mtime_ns != mtime_ns:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def _cached_agent_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        查找磁盘缓存中的 agent 配置条目
+
+        所有相关文件（config.json 和 prompt 文件）的 mtime 均未变化时才命中
+        """
+        entry = self._get_disk_cache().get(cache_key)
+        if entry is None:
+            return None
+
+        if not self._stamps_unchanged(entry['stamps']):
+            return None
+
+        return entry
+
+    def _store_agent_entry(
+        self,
+        cache_key: str,
+        stamps: Dict[str, int],
+        agent_config: AgentConfig,
+        prompts: Dict[str, str]
+    ):
+        """写入 agent 配置到磁盘缓存"""
+        cache = self._get_disk_cache()
+        cache[cache_key] = {
+            'stamps': stamps,
+            'agent_config': agent_config,
+            'prompts': prompts,
+        }
+        _save_agent_disk_cache(cache)
 
     def load(self) -> Config:
         """加载主配置文件"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
+        # 文件未变化时直接复用已解析的配置（重复调用 load 变为 O(1)）
+        mtime_ns = self.config_path.stat().st_mtime_ns
+        if self.config is not None and self._config_mtime_ns == mtime_ns:
+            return self.config
+
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_dict = yaml.safe_load(f)
+                config_dict = yaml.load(f, Loader=_YamlLoader)
 
             # 扩展环境变量（非严格模式，保留未设置的环境变量）
             config_dict = expand_env_vars(config_dict, strict=False)
 
-            # 过滤掉 enabled=false 的 models
-            original_model_count = len(config_dict.get('models', {}))
-            if 'models' in config_dict:
-                config_dict['models'] = {
-                    name: model_config
-                    for name, model_config in config_dict['models'].items()
-                    if model_config.get('enabled', True)  # 默认为 True
-                }
-                disabled_models = original_model_count - len(config_dict['models'])
-                if disabled_models > 0:
-                    logger.debug(f"跳过 {disabled_models} 个禁用的模型")
-
-            # 过滤掉 enabled=false 的 agents
-            original_agent_count = len(config_dict.get('agents', {}))
-            if 'agents' in config_dict:
-                config_dict['agents'] = {
-                    name: agent_config
-                    for name, agent_config in config_dict['agents'].items()
-                    if agent_config.get('enabled', True)  # 默认为 True
-                }
-                disabled_agents = original_agent_count - len(config_dict['agents'])
-                if disabled_agents > 0:
-                    logger.debug(f"跳过 {disabled_agents} 个禁用的 Agent")
+            # 过滤掉 enabled=false 的 models（原地删除，不重建字典）
+            models = config_dict.get('models')
+            if models:
+                disabled_models = [
+                    name for name, model_config in models.items()
+                    if not model_config.get('enabled', True)  # 默认为 True
+                ]
+                for name in disabled_models:
+                    del models[name]
+                if disabled_models:
+                    logger.debug(f"跳过 {len(disabled_models)} 个禁用的模型")
+
+            # 过滤掉 enabled=false 的 agents（原地删除，不重建字典）
+            agents = config_dict.get('agents')
+            if agents:
+                disabled_agents = [
+                    name for name, agent_config in agents.items()
+                    if not agent_config.get('enabled', True)  # 默认为 True
+                ]
+                for name in disabled_agents:
+                    del agents[name]
+                if disabled_agents:
+                    logger.debug(f"跳过 {len(disabled_agents)} 个禁用的 Agent")
 
             self.config = Config(**config_dict)
+            self._config_mtime_ns = mtime_ns
+            # 配置已重建，按旧配置解析出的模型缓存随之失效
+            self._resolved_models.clear()
             logger.info(f"成功加载配置文件: {self.config_path}")
             logger.debug(f"已加载 {len(self.config.models)} 个模型，{len(self.config.agents)} 个 Agent")
 
@@ -258,12 +437,36 @@ class ConfigLoader:
         if not config_path.exists():
             raise FileNotFoundError(f"Agent 配置文件不存在: {config_path}")
 
+        # 进程内命中：同名 agent 已加载且相关文件（含 prompt 文件）
+        # 的 mtime 全部未变化时直接返回
+        cached_config = self.agent_configs.get(agent_name)
+        if cached_config is not None:
+            stamps = self._agent_stamps.get(agent_name)
+            if stamps is not None and self._stamps_unchanged(stamps):
+                return cached_config, self.agent_prompts[agent_name]
+
+        # 其次从磁盘缓存加载（mtime 校验通过时跳过全部解析）
+        cache_key = str(config_path.resolve())
+        cached = self._cached_agent_entry(cache_key)
+        if cached is not None:
+            agent_config = cached['agent_config']
+            prompts = cached['prompts']
+            self.agent_configs[agent_name] = agent_config
+            self.agent_prompts[agent_name] = prompts
+            self._agent_stamps[agent_name] = cached['stamps']
+            logger.debug(f"从缓存加载 Agent '{agent_name}' 的配置")
+            return agent_config, prompts
+
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                agent_config_dict = json.load(f)
+            config_text, config_mtime = self._read_text_cached(config_path)
+            agent_config_dict = json.loads(config_text)
 
             agent_config = AgentConfig(**agent_config_dict)
 
+            # 记录相关文件的 mtime，作为磁盘缓存的失效依据
+            # （mtime 直接复用读取时的结果，不再额外 stat）
+            stamps = {cache_key: config_mtime}
+
             # 加载 prompts
             agent_dir = config_path.parent
             prompts = {}
@@ -273,24 +476,26 @@ class ConfigLoader:
             if not system_prompt_path.exists():
                 raise FileNotFoundError(f"System prompt 文件不存在: {system_prompt_path}")
 
-            with open(system_prompt_path, 'r', encoding='utf-8') as f:
-                prompts['system'] = f.read()
+            prompts['system'], sys_mtime = self._read_text_cached(system_prompt_path)
+            stamps[str(system_prompt_path)] = sys_mtime
 
             # 加载 user prompt (可选)
             if agent_config.user_prompt:
                 user_prompt_path = agent_dir / agent_config.user_prompt
                 if user_prompt_path.exists():
-                    with open(user_prompt_path, 'r', encoding='utf-8') as f:
-                        prompts['user'] = f.read()
+                    prompts['user'], user_mtime = self._read_text_cached(user_prompt_path)
+                    stamps[str(user_prompt_path)] = user_mtime
                 else:
                     logger.warning(f"User prompt 文件不存在: {user_prompt_path}")
                     prompts['user'] = ""
             else:
                 prompts['user'] = ""
 
-            # 缓存
+            # 缓存（进程内 + 磁盘，供后续 CLI 调用复用）
             self.agent_configs[agent_name] = agent_config
             self.agent_prompts[agent_name] = prompts
+            self._agent_stamps[agent_name] = stamps
+            self._store_agent_entry(cache_key, stamps, agent_config, prompts)
 
             logger.info(f"成功加载 Agent '{agent_name}' 的配置")
 
@@ -308,14 +513,27 @@ class ConfigLoader:
         if model_name not in self.config.models:
             raise ValueError(f"模型 '{model_name}' 不存在或未启用")
 
+        # 命中缓存时跳过 .dict() 拷贝、环境变量展开和 pydantic 重建
+        resolved = self._resolved_models.get(model_name)
+        if resolved is not None:
+            return resolved
+
         # 获取模型配置（已过滤掉未启用的模型）
         model_config = self.config.models[model_name]
         model_dict = model_config.dict()
 
+        # 没有任何 ${VAR} 引用时（load 阶段已展开完的常见情况），
+        # 展开+重建整个是空操作，直接复用已验证的原对象
+        if not _needs_expand(model_dict):
+            self._resolved_models[model_name] = model_config
+            return model_config
+
         # 严格验证环境变量，确保所有必需的环境变量都已设置
         model_dict = expand_env_vars(model_dict, strict=True)
 
-        return ModelConfig(**model_dict)
+        resolved = ModelConfig(**model_dict)
+        self._resolved_models[model_name] = resolved
+        return resolved
 
     def list_models(self) -> Dict[str, ModelConfig]:
         """列出所有模型"""